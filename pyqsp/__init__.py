@@ -1 +1,9 @@
-from . import poly
+import importlib
+
+
+def __getattr__(name):
+    # pyqsp.poly imports scipy.optimize and scipy.interpolate, so it is only
+    # imported when first used as pyqsp.poly
+    if name == "poly":
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,7 +6,6 @@ from numpy.polynomial.polynomial import Polynomial
 from pyqsp.completion import completion_from_root_finding
 from pyqsp.decomposition import angseq
 from pyqsp.LPoly import LAlg, LPoly
-from pyqsp.poly import StringPolynomial, TargetPolynomial
 from pyqsp.response import ComputeQSPResponse
 
 
@@ -123,8 +122,12 @@ def QuantumSignalProcessingPhases(
     """
     if isinstance(poly, np.ndarray) or isinstance(poly, list):
         poly = Polynomial(poly)
-    elif isinstance(poly, TargetPolynomial):
-        poly = Polynomial(poly.coef)
+    elif type(poly) is not Polynomial and isinstance(poly, Polynomial):
+        # pyqsp.poly is not imported at module level, to avoid its scipy
+        # imports; a TargetPolynomial can only exist once it has been imported
+        from pyqsp.poly import TargetPolynomial
+        if isinstance(poly, TargetPolynomial):
+            poly = Polynomial(poly.coef)
 
     if measurement is None:
         if signal_operator == "Wx":
@@ -206,6 +209,8 @@ def QuantumSignalProcessingPhasesWithTensorflow(
     import pyqsp.qsp_models as qsp_models
     import tensorflow as tf
 
+    from pyqsp.poly import StringPolynomial
+
     if not (
         isinstance(
             poly,
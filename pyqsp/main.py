@@ -2,13 +2,19 @@ import argparse
 import json
 import sys
 
+try:
+    from importlib.metadata import version as _package_version
+except ImportError:  # python < 3.8
+    import pkg_resources  # part of setuptools
+
+    def _package_version(name):
+        return pkg_resources.require(name)[0].version
+
 import numpy as np
 
 import pyqsp
-from pyqsp import angle_sequence, response
+from pyqsp import angle_sequence
 from pyqsp.phases import phase_generators
-from pyqsp.poly import (StringPolynomial, TargetPolynomial,
-                        polynomial_generators)
 
 # -----------------------------------------------------------------------------
 
@@ -22,14 +28,56 @@ class VAction(argparse.Action):
 # -----------------------------------------------------------------------------
 
 
-def CommandLine(args=None, arglist=None):
+def float_list(value):
+    try:
+        if not ',' in value and value.startswith("[") and value.endswith("]"):
+            fstrset = value[1:-1].split(" ")
+            fstrset = [x for x in fstrset if x]
+            flist = list(map(float, fstrset))
+            return flist
+        return list(map(float, value.split(",")))
+    except Exception as err:
+        print(
+            f"[pyqsp.float_list] failed to parse float list, err={err} from {value}")
+        raise
+
+# -----------------------------------------------------------------------------
+
+
+def _phiset_to_json(phiset):
     '''
-    Main command line.  Accepts args, to allow for simple unit testing.
+    Return JSON string for the list (or numpy array) of QSP phase angles phiset.
     '''
-    import pkg_resources  # part of setuptools
+    if not isinstance(phiset, list):
+        phiset = phiset.tolist()
+    return json.dumps(phiset)
+
+# -----------------------------------------------------------------------------
 
-    version = pkg_resources.require("pyqsp")[0].version
-    help_text = """usage: pyqsp [options] cmd
+response = None
+
+
+def _get_response(show=True):
+    '''
+    Return the pyqsp.response module, importing it on first use, so that
+    commands which do not plot avoid the import.  Called just before a plot is
+    made; if show is False, and matplotlib.pyplot has not been imported yet
+    (e.g. by a notebook running the command), the non-interactive Agg backend
+    is selected, so that no GUI backend is initialized for a plot which is
+    never shown.
+    '''
+    global response
+    if not show and 'matplotlib.pyplot' not in sys.modules:
+        import matplotlib
+        matplotlib.use('Agg')
+    if response is None:
+        import pyqsp.response as _response
+        response = _response
+    return response
+
+# -----------------------------------------------------------------------------
+
+HELP_TEXT = """usage: pyqsp [options] cmd
 
 Version: {}
 Commands:
@@ -62,24 +110,41 @@ Examples:
     pyqsp --plot-positive-only --plot-real-only --plot --polyargs 20,3.5 --polyname gibbs --plot-qsp-model poly
     pyqsp --polydeg 16 --measurement="z" --func="-1+np.sign(1/np.sqrt(2)-x)+ np.sign(1/np.sqrt(2)+x)" --plot polyfunc
 
-""".format(version)
-
-    parser = argparse.ArgumentParser(
-        description=help_text,
-        formatter_class=argparse.RawTextHelpFormatter)
-
-    def float_list(value):
-        try:
-            if not ',' in value and value.startswith("[") and value.endswith("]"):
-                fstrset = value[1:-1].split(" ")
-                fstrset = [x for x in fstrset if x]
-                flist = list(map(float, fstrset))
-                return flist
-            return list(map(float, value.split(",")))
-        except Exception as err:
-            print(
-                f"[pyqsp.float_list] failed to parse float list, err={err} from {value}")
-            raise
+"""
+
+
+def _help_text():
+    '''
+    Return the command line help text, including the pyqsp version.
+    '''
+    return HELP_TEXT.format(_package_version("pyqsp"))
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    '''
+    ArgumentParser which only generates its description (the help text, which
+    requires looking up the package version) when help is actually shown.
+    '''
+
+    def format_help(self):
+        if self.description is None:
+            self.description = _help_text()
+        return super().format_help()
+
+# -----------------------------------------------------------------------------
+
+_PARSER = None
+
+
+def _get_parser():
+    '''
+    Return the command line argument parser, building it on first use.
+    '''
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+
+    parser = _ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
 
     parser.add_argument("cmd", help="command")
     parser.add_argument(
@@ -219,10 +284,25 @@ Examples:
         type=int,
         default=30)
 
+    _PARSER = parser
+    return parser
+
+# -----------------------------------------------------------------------------
+
+
+def CommandLine(args=None, arglist=None):
+    '''
+    Main command line.  Accepts args, to allow for simple unit testing.
+    '''
     if not args:
-        args = parser.parse_args(arglist)
+        args = _get_parser().parse_args(arglist)
 
     phiset = None
+    # the grid is shared by the QSP response and the target function plots
+    if args.plot_positive_only:
+        plot_x = np.linspace(0., 1., args.plot_npts)
+    else:
+        plot_x = np.linspace(-1., 1., args.plot_npts)
     plot_args = dict(plot_magnitude=args.plot_magnitude,
                      plot_probability=args.plot_probability,
                      plot_positive_only=args.plot_positive_only,
@@ -231,6 +311,7 @@ Examples:
                      npts=args.plot_npts,
                      show=(not args.hide_plot),
                      show_qsp_model_plot=args.plot_qsp_model,
+                     x_grid=plot_x,
                      )
 
     qspp_args = dict(signal_operator=args.signal_operator,
@@ -252,7 +333,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             coefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 pcoefs=coefs,
                 signal_operator=args.signal_operator,
@@ -268,7 +349,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * np.cos(args.seqargs[0] * x),
                 signal_operator="Wx",
@@ -284,7 +365,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * np.sin(args.seqargs[0] * x),
                 signal_operator="Wx",
@@ -295,7 +376,7 @@ Examples:
         pg = pyqsp.phases.FPSearch()
         phiset = pg.generate(*args.seqargs)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 signal_operator="Wx",
                 measurement="z",
@@ -312,7 +393,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * 1 / x,
                 signal_operator="Wx",
@@ -329,7 +410,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * np.exp(-args.seqargs[1] * x),
                 signal_operator="Wx",
@@ -346,10 +427,9 @@ Examples:
             pcoefs, **qspp_args)
         if args.plot:
             delta = args.seqargs[1] / 2.
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
-                target=lambda x: scale *
-                (np.sign(x + delta) - np.sign(x - delta)) / 2,
+                target=lambda x: scale * (np.abs(x) < delta),
                 signal_operator="Wx",
                 title="Eigenstate filtering",
                 **plot_args)
@@ -363,7 +443,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * np.maximum(x - args.seqargs[1], 0.),
                 signal_operator="Wx",
@@ -379,7 +459,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * np.sign(x),
                 signal_operator="Wx",
@@ -395,10 +475,9 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
-                target=lambda x: scale *
-                (np.sign(x + 0.5) - np.sign(x - 0.5)) / 2,
+                target=lambda x: scale * (np.abs(x) < 0.5),
                 signal_operator="Wx",
                 title="Threshold Function",
                 **plot_args)
@@ -412,10 +491,10 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
-                target=lambda x: scale *
-                (-1 + np.sign(1/np.sqrt(2) - x) + np.sign(1/np.sqrt(2) + x)),
+                target=lambda x: np.where(
+                    np.abs(x) < 1 / np.sqrt(2), scale, -scale),
                 signal_operator="Wx",
                 title="Phase Estimation Polynomial",
                 **plot_args)
@@ -429,11 +508,9 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
-                target=lambda x: scale *
-                1 - (np.sign(x + 1 / args.kappa) -
-                     np.sign(x - 1 / args.kappa)) / 2,
+                target=lambda x: scale * 1 - (np.abs(x) < 1 / args.kappa),
                 signal_operator="Wx",
                 title="Rect Function",
                 **plot_args)
@@ -447,7 +524,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * 1 / x,
                 signal_operator="Wx",
@@ -463,7 +540,7 @@ Examples:
         phiset = angle_sequence.QuantumSignalProcessingPhases(
             pcoefs, **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=lambda x: scale * x / (2 * args.seqargs[1]),
                 signal_operator="Wx",
@@ -471,6 +548,7 @@ Examples:
                 **plot_args)
 
     elif args.cmd == "poly":
+        from pyqsp.poly import TargetPolynomial, polynomial_generators
         if not args.polyname or args.polyname not in polynomial_generators:
             print(
                 f'Known polynomial generators: {",".join(polynomial_generators.keys())}')
@@ -487,7 +565,7 @@ Examples:
             target = None
             if isinstance(pcoefs, TargetPolynomial):
                 target = pcoefs.target
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 pcoefs=pcoefs,
                 target=target,
@@ -506,12 +584,14 @@ Examples:
         phiset = pg.generate(*args.seqargs)
         print(f"[pysqp] phiset={phiset}")
         if args.plot:
-            response.PlotQSPResponse(phiset, signal_operator="Wx", **plot_args)
+            _get_response(plot_args['show']).PlotQSPResponse(
+                phiset, signal_operator="Wx", **plot_args)
 
     elif args.cmd == "polyfunc":
         if (not args.func) or (not args.polydeg):
             print(f"Must specify --func and --polydeg")
             return
+        from pyqsp.poly import StringPolynomial
         qspp_args['method'] = 'tf'
         poly = StringPolynomial(args.func, args.polydeg)
         phiset = angle_sequence.QuantumSignalProcessingPhases(
@@ -519,7 +599,7 @@ Examples:
             measurement=args.measurement,
             **qspp_args)
         if args.plot:
-            response.PlotQSPResponse(
+            _get_response(plot_args['show']).PlotQSPResponse(
                 phiset,
                 target=poly,
                 signal_operator="Wx",
@@ -531,12 +611,12 @@ Examples:
         if not args.phiset:
             print("Must specify --phiset")
         phiset = args.phiset
-        response.PlotQSPResponse(
+        _get_response(plot_args['show']).PlotQSPResponse(
             phiset, signal_operator=args.signal_operator, **plot_args)
 
     else:
         print(f"[pyqsp.main] Unknown command {args.cmd}")
-        print(help_text)
+        print(_help_text())
 
     if (phiset is not None):
         if args.return_angles:
@@ -544,6 +624,4 @@ Examples:
         if args.output_json:
             print(
                 f"QSP Phase angles (for signal_operator={args.signal_operator}) in JSON format:")
-            if not isinstance(phiset, list):
-                phiset = phiset.tolist()
-            print(json.dumps(phiset))
+            print(_phiset_to_json(phiset))
@@ -1,3 +1,5 @@
+import functools
+
 import numpy as np
 import scipy.optimize
 import scipy.special
@@ -80,6 +82,41 @@ class PolyGenerator:
 # -----------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=64)
+def _minimize_polynomial(poly_class, coefs, x0, bounds):
+    '''
+    Return the location (as a read-only array of shape (1,)) of the minimum of
+    the polynomial poly_class(coefs) within bounds, searching from x0.
+
+    Cached on the coefficients, since the same polynomials are normalized
+    repeatedly, e.g. PolyOneOverXRect and the invert command both generate
+    PolyOneOverX for the same kappa and epsilon.
+    '''
+    res = scipy.optimize.minimize(poly_class(coefs), (x0,), bounds=[bounds])
+    pmin = res.x
+    pmin.flags.writeable = False
+    return pmin
+
+
+@functools.lru_cache(maxsize=64)
+def _jacobi_anger_bessel(tau, epsilon):
+    '''
+    Return (r, R, jvs) for the Jacobi-Anger expansion of cos(tau x) and sin(tau x)
+    to error epsilon, where R is the truncation order, and jvs holds the Bessel
+    function values J_k(tau) for k = 0, ..., 2R+1.
+
+    Cached, since the Hamiltonian simulation command generates both the cosine
+    and sine polynomials for the same tau and epsilon.
+    '''
+    r = scipy.optimize.fsolve(lambda r: (
+        np.e * np.abs(tau) / (2 * r))**r - (5 / 4) * epsilon, tau)[0]
+    R = np.floor(r / 2).astype(int)
+    R = max(R, 1)
+    jvs = scipy.special.jv(np.arange(2 * R + 2), tau)
+    jvs.flags.writeable = False
+    return r, R, jvs
+
+
 class PolyCosineTX(PolyGenerator):
 
     def help(self):
@@ -100,20 +137,15 @@ class PolyCosineTX(PolyGenerator):
         ensure_bounded: True if polynomial should be normalized to be between
         +/- 1
         '''
-        r = scipy.optimize.fsolve(lambda r: (
-            np.e * np.abs(tau) / (2 * r))**r - (5 / 4) * epsilon, tau)[0]
+        r, R, jvs = _jacobi_anger_bessel(tau, epsilon)
         print(r)
-        R = np.floor(r / 2).astype(int)
-        R = max(R, 1)
-
         print(f"R={R}")
 
-        g = scipy.special.jv(0, tau) * np.polynomial.chebyshev.Chebyshev([1])
-        for k in range(1, R + 1):
-            gcoef = 2 * scipy.special.jv(2 * k, tau)
-            deg = 2 * k
-            g += (-1)**k * gcoef * \
-                np.polynomial.chebyshev.Chebyshev([0] * deg + [1])
+        # cos(tau x) = J_0(tau) + 2 sum_k (-1)^k J_2k(tau) T_2k(x)
+        coefs = np.zeros(2 * R + 1)
+        coefs[0::2] = 2 * (-1)**np.arange(R + 1) * jvs[0:2 * R + 1:2]
+        coefs[0] = jvs[0]
+        g = np.polynomial.chebyshev.Chebyshev(coefs)
 
         if ensure_bounded:
             scale = 0.5
@@ -149,20 +181,14 @@ class PolySineTX(PolyGenerator):
         ensure_bounded: True if polynomial should be normalized to be between
         +/- 1
         '''
-        r = scipy.optimize.fsolve(lambda r: (
-            np.e * np.abs(tau) / (2 * r))**r - (5 / 4) * epsilon, tau)[0]
+        r, R, jvs = _jacobi_anger_bessel(tau, epsilon)
         print(r)
-        R = np.floor(r / 2).astype(int)
-        R = max(R, 1)
-
         print(f"R={R}")
 
-        g = np.polynomial.chebyshev.Chebyshev([0])
-        for k in range(0, R + 1):
-            gcoef = 2 * scipy.special.jv(2 * k + 1, tau)
-            deg = 2 * k + 1
-            g += (-1)**k * gcoef * \
-                np.polynomial.chebyshev.Chebyshev([0] * deg + [1])
+        # sin(tau x) = 2 sum_k (-1)^k J_2k+1(tau) T_2k+1(x)
+        coefs = np.zeros(2 * R + 2)
+        coefs[1::2] = 2 * (-1)**np.arange(R + 1) * jvs[1::2]
+        g = np.polynomial.chebyshev.Chebyshev(coefs)
 
         if ensure_bounded:
             scale = 0.5
@@ -207,19 +233,21 @@ class PolyOneOverX(PolyGenerator):
         j0 = int(np.sqrt(b * np.log(4 * b / epsilon)))
         print(f"b={b}, j0={j0}")
 
-        g = np.polynomial.chebyshev.Chebyshev([0])
-        for j in range(j0 + 1):
-            gcoef = 0
-            for i in range(j + 1, b + 1):
-                gcoef += scipy.special.binom(2 * b, b + i) / 2**(2 * b)
-            deg = 2 * j + 1
-            g += (-1)**j * gcoef * \
-                np.polynomial.chebyshev.Chebyshev([0] * deg + [1])
-        g = 4 * g
+        # coefficient of T_2j+1 is 4 (-1)^j sum_{i=j+1}^b binom(2b, b+i) / 2^2b,
+        # i.e. a tail sum of the binomial terms
+        terms = scipy.special.binom(2 * b, b + np.arange(1, b + 1)) / 2**(2 * b)
+        tails = np.append(np.cumsum(terms[::-1])[::-1], 0.)
+        gcoefs = np.zeros(j0 + 1)
+        nj = min(j0, b) + 1
+        gcoefs[:nj] = tails[:nj]
+        coefs = np.zeros(2 * j0 + 2)
+        coefs[1::2] = 4 * (-1)**np.arange(j0 + 1) * gcoefs
+        g = np.polynomial.chebyshev.Chebyshev(coefs)
 
         if ensure_bounded:
-            res = scipy.optimize.minimize(g, (-0.1,), bounds=[(-0.8, 0.8)])
-            pmin = res.x
+            pmin = _minimize_polynomial(
+                np.polynomial.chebyshev.Chebyshev, tuple(g.coef), -0.1,
+                (-0.8, 0.8))
             print(
                 f"[PolyOneOverX] minimum {g(pmin)} is at {pmin}: normalizing")
             scale = 1 / abs(g(pmin))
@@ -305,8 +333,8 @@ class PolyTaylorSeries(PolyGenerator):
         the_poly = approximate_taylor_polynomial(func, 0, degree, 1)
         the_poly = np.polynomial.Polynomial(the_poly.coef[::-1])
         if ensure_bounded:
-            res = scipy.optimize.minimize(-the_poly, (0.1,), bounds=[(-1, 1)])
-            pmax = res.x
+            pmax = _minimize_polynomial(
+                np.polynomial.Polynomial, tuple(-the_poly.coef), 0.1, (-1, 1))
             scale = 1 / abs(the_poly(pmax))
             # use this for the new QuantumSignalProcessingWxPhases code, which
             # employs np.polynomial.chebyshev.poly2cheb(pcoefs)
@@ -644,8 +672,9 @@ class PolyEigenstateFiltering(PolyTaylorSeries):
         if (degree % 2):
             raise Exception("[PolyEfilter] degree must be even")
 
+        Tk = np.polynomial.chebyshev.Chebyshev.basis(degree)
+
         def cheb(x):
-            Tk = np.polynomial.chebyshev.Chebyshev([0] * degree + [1])
             return Tk(-1 + 2 * (x**2 - delta**2) / (1 - delta**2))
         scale = 1 / cheb(0)
 
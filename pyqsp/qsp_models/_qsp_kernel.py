@@ -0,0 +1,144 @@
+"""Batched evaluation of the single qubit QSP sequence used by QSPCircuit
+
+The sequence rz(phis[0]), rx, rz(phis[1]), ..., rx, rz(phis[-1]) is just a
+chain of 2x2 matrix products, so it is evaluated directly here rather than
+by simulating the circuit.  Numba is used when available; otherwise (or if
+compilation fails) a vectorized numpy implementation is used instead.
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def rz_table(phis):
+    """Stack the rz(phi) matrices of the sequence into an array of shape (len(phis), 2, 2)"""
+    phis = np.asarray(phis, dtype=np.float64)
+    # rz(phi) = diag(exp(-i phi/2), exp(i phi/2))
+    rz = np.zeros((len(phis), 2, 2), dtype=np.complex128)
+    rz[:, 0, 0] = np.exp(-0.5j * phis)
+    rz[:, 1, 1] = np.exp(0.5j * phis)
+    return rz
+
+
+def _su2_from_top_row(a00, a01):
+    """Pack the top rows (a00, a01) of SU(2) matrices into an array of shape (len(a00), 2, 2)"""
+    us = np.empty((len(a00), 2, 2), dtype=np.complex128)
+    us[:, 0, 0] = a00
+    us[:, 0, 1] = a01
+    us[:, 1, 0] = -np.conj(a01)
+    us[:, 1, 1] = np.conj(a00)
+    return us
+
+
+def _qsp_unitaries_numpy(rz, thetas):
+    """numpy implementation of qsp_unitary_kernel"""
+    # theta is resolved as -2 * theta, so that
+    # rx(-2 * theta) = [[cos(theta), i sin(theta)], [i sin(theta), cos(theta)]]
+    c = np.cos(thetas)
+    js = 1j * np.sin(thetas)
+    # the entries of the unitaries are kept as contiguous arrays (rather than
+    # one (N, 2, 2) array), so each step is a few unit-stride operations.
+    # All the factors are in SU(2), so every partial product has the form
+    # [[a00, a01], [-conj(a01), conj(a00)]] and only its top row is tracked
+    a00 = np.full(len(thetas), rz[0, 0, 0])
+    a01 = np.zeros(len(thetas), dtype=np.complex128)
+    for k in range(1, len(rz)):
+        # top row of rz @ (rx @ a)
+        a00, a01 = (rz[k, 0, 0] * (c * a00 - js * np.conj(a01)),
+                    rz[k, 0, 0] * (c * a01 + js * np.conj(a00)))
+    return _su2_from_top_row(a00, a01)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _qsp_unitaries_numba(rz, thetas):
+        """numba implementation of qsp_unitary_kernel"""
+        us = np.empty((thetas.shape[0], 2, 2), dtype=np.complex128)
+        for n in numba.prange(thetas.shape[0]):
+            c = np.cos(thetas[n])
+            s = np.sin(thetas[n])
+            js = 1j * s
+            # only the top row is tracked; see _qsp_unitaries_numpy
+            a00 = rz[0, 0, 0]
+            a01 = 0j
+            for k in range(1, rz.shape[0]):
+                # top row of rx @ a
+                b00 = c * a00 - js * np.conj(a01)
+                b01 = c * a01 + js * np.conj(a00)
+                # top row of rz @ (rx @ a)
+                a00 = rz[k, 0, 0] * b00
+                a01 = rz[k, 0, 0] * b01
+            us[n, 0, 0] = a00
+            us[n, 0, 1] = a01
+            us[n, 1, 0] = -np.conj(a01)
+            us[n, 1, 1] = np.conj(a00)
+        return us
+
+    @numba.njit(cache=True)
+    def _apply_qsp_chain(rz, theta, out_state):
+        """Apply the QSP sequence for a single theta to the state out_state, in place"""
+        c = np.cos(theta)
+        js = 1j * np.sin(theta)
+        s0 = rz[0, 0, 0] * out_state[0]
+        s1 = rz[0, 1, 1] * out_state[1]
+        for k in range(1, rz.shape[0]):
+            b0 = c * s0 + js * s1
+            b1 = js * s0 + c * s1
+            s0 = rz[k, 0, 0] * b0
+            s1 = rz[k, 1, 1] * b1
+        out_state[0] = s0
+        out_state[1] = s1
+
+    # compile (or load from the cache) at import, rather than on first use
+    try:
+        _apply_qsp_chain(rz_table(np.zeros(2)), 0.,
+                         np.zeros(2, dtype=np.complex128))
+    except numba.core.errors.NumbaError:
+        _apply_qsp_chain = None
+else:
+    _qsp_unitaries_numba = None
+    _apply_qsp_chain = None
+
+
+def _qsp_unitary_single(rz, theta):
+    """Evaluate the unitary for a single theta using _apply_qsp_chain
+
+    The unitary is in SU(2), so it is fixed by its first column U|0>.
+    """
+    state = np.array([1, 0], dtype=np.complex128)
+    _apply_qsp_chain(rz, theta, state)
+    # U = [[u00, u01], [u10, u11]] with u01 = -conj(u10) and u11 = conj(u00)
+    return _su2_from_top_row(state[:1], -np.conj(state[1:]))
+
+
+def qsp_unitary_kernel(rz, thetas):
+    """Evaluate the unitary of a QSP sequence for every theta in thetas
+
+    params
+    -----
+    rz: numpy array with shape (len(phis), 2, 2)
+        rz matrices of the sequence, as returned by rz_table
+    thetas: numpy array of floats
+        theta inputs of the QSP sequence, with x = cos(theta)
+
+    returns
+    -------
+    numpy array with shape (len(thetas), 2, 2)
+        the unitary U, with P(x) = U[0, 0] and Q(x) = U[0, 1] / (i * sin(theta))
+    """
+    global _qsp_unitaries_numba
+    thetas = np.asarray(thetas, dtype=np.float64)
+    if _apply_qsp_chain is not None and thetas.shape[0] == 1:
+        # not worth starting the parallel batched kernel for a single theta
+        return _qsp_unitary_single(rz, thetas[0])
+    if _qsp_unitaries_numba is not None:
+        try:
+            return _qsp_unitaries_numba(rz, thetas)
+        except numba.core.errors.NumbaError as err:
+            print(
+                f"[pyqsp.qsp_models] numba kernel failed, err={err}; falling back to numpy")
+            _qsp_unitaries_numba = None
+    return _qsp_unitaries_numpy(rz, thetas)
@@ -1,8 +1,12 @@
+import os
+
 import cirq
 import numpy as np
 import sympy
 from cirq.contrib.svg import SVGCircuit
 
+from ._qsp_kernel import qsp_unitary_kernel, rz_table
+
 
 class QSPCircuit(cirq.Circuit):
     """QSP circuit
@@ -18,7 +22,10 @@ class QSPCircuit(cirq.Circuit):
         super(QSPCircuit, self).__init__()
         # recall that in the QSP sequence we rotate as exp(i * phi * Z), but
         # rz(theta) := exp(i * theta/2 * Z)
-        self.phis = np.array(phis).flatten() * (-2)
+        self.phis = np.ravel(np.asarray(phis)) * (-2)
+        # the rz matrices do not depend on theta, so only build them once
+        self._rz = rz_table(self.phis)
+        self._U_cache = None
         self.theta = sympy.Symbol("theta")
         self.q = cirq.GridQubit(0, 0)
         self._build_qsp_sequence(self.q)
@@ -29,6 +36,47 @@ class QSPCircuit(cirq.Circuit):
             c = cirq.Circuit(cirq.rx(self.theta)(q), cirq.rz(phi)(q))
             self.append(c)
 
+    def _simulate_unitaries(self, thetas):
+        """Evaluate the QSP unitary by resolving and simulating the cirq circuit per theta
+
+        This is much slower than qsp_unitary_kernel, and is only used (for
+        validation) when PYQSP_USE_CIRQ is set in the environment.
+        """
+        us = []
+        for theta in thetas:
+            resolver = cirq.ParamResolver({"theta": theta * (-2)})
+            us.append(cirq.resolve_parameters(self, resolver).unitary())
+        return np.array(us).reshape((len(thetas), 2, 2))
+
+    def _eval_U(self, thetas):
+        """Evaluate the QSP unitary for a flat array of thetas
+
+        Both P(x) and Q(x) are read off the same unitary, and callers such
+        as compute_qsp_response ask for both on the same grid, so the last
+        result is kept and reused when the same thetas are passed again.
+
+        returns
+        -------
+        numpy array with shape (len(thetas), 2, 2)
+        """
+        use_cirq = bool(os.environ.get('PYQSP_USE_CIRQ'))
+        key = (use_cirq, thetas.tobytes())
+        if self._U_cache is not None and self._U_cache[0] == key:
+            return self._U_cache[1]
+        if use_cirq:
+            u = self._simulate_unitaries(thetas)
+        else:
+            u = qsp_unitary_kernel(self._rz, thetas)
+        self._U_cache = (key, u)
+        return u
+
+    @staticmethod
+    def _qx_from_unitaries(u, thetas):
+        """Q(x) = U[0, 1] / (i * sqrt(1 - x^2))"""
+        denom = np.sin(thetas)
+        denom[denom == 0] = 1.0e-8
+        return u[:, 0, 1] / (1j * denom)
+
     def svg(self):
         """Get the SVG circuit (for visualization)"""
         return SVGCircuit(self)
@@ -46,8 +94,10 @@ class QSPCircuit(cirq.Circuit):
         numpy array with shape (len(params),)
             evaluates the qsp response Re[P(x)] + i * Re[Q(x)] * sqrt(1-x^2) from post selecting on |+> for each theta in thetas
         """
-        return np.real(self.eval_px(thetas)) + \
-            1j * np.real(self.eval_qx(thetas)) * np.sin(thetas)
+        thetas = np.ravel(np.asarray(thetas))
+        u = self._eval_U(thetas)
+        return np.real(u[:, 0, 0]) + \
+            1j * np.real(self._qx_from_unitaries(u, thetas)) * np.sin(thetas)
 
     def eval_px(self, thetas):
         """Evaluate P(x) for a list of thetas
@@ -62,12 +112,8 @@ class QSPCircuit(cirq.Circuit):
         numpy array with shape (len(params),)
             evaluates P(x) from the resulting QSP sequence for each theta in thetas
         """
-        pxs = []
-        for theta in np.array(thetas).flatten():
-            resolver = cirq.ParamResolver({"theta": theta * (-2)})
-            u = cirq.resolve_parameters(self, resolver).unitary()
-            pxs.append(u[0, 0])
-        return np.array(pxs)
+        thetas = np.ravel(np.asarray(thetas))
+        return self._eval_U(thetas)[:, 0, 0].copy()
 
     def eval_real_px(self, thetas):
         """Evaluate the QSP response (real part) for a list of thetas"""
@@ -90,12 +136,5 @@ class QSPCircuit(cirq.Circuit):
         numpy array with shape (len(params),)
             evaluates Q(x) from the resulting QSP sequence for each theta in thetas
         """
-        qxs = []
-        for theta in np.array(thetas).flatten():
-            resolver = cirq.ParamResolver({"theta": theta * (-2)})
-            u = cirq.resolve_parameters(self, resolver).unitary()
-            denom = np.sin(theta)
-            if denom==0:
-                denom = 1.0e-8
-            qxs.append(u[0, 1] / (1j * denom))
-        return np.array(qxs)
+        thetas = np.ravel(np.asarray(thetas))
+        return self._qx_from_unitaries(self._eval_U(thetas), thetas)
@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import scipy.linalg
 
@@ -7,11 +6,28 @@ class ResponseError(Exception):
     pass
 
 
+def _chebyshev_fit_is_faster(npts, nphases):
+    """
+    Estimate whether ComputeQSPResponse is faster with chebyshev_fit=True.
+
+    Costs are counted in steps of the QSP sequence at one point: evaluating
+    directly takes npts * nphases of them, and the fit takes
+    2 * nphases**2 at the Chebyshev nodes.  Computing the Chebyshev
+    coefficients (O(nphases**2)) and evaluating the series at the points
+    (O(npts * nphases)) are vector operations that each cost under 5% of a
+    sequence step, and are counted as such.
+    """
+    direct = npts * nphases
+    fit = 2 * nphases**2 + 0.05 * (nphases**2 + npts * nphases)
+    return fit < direct
+
+
 def ComputeQSPResponse(
         adat,
         phiset,
         signal_operator="Wx",
-        measurement=None):
+        measurement=None,
+        chebyshev_fit=False):
     """
     Compute QSP response.
 
@@ -20,11 +36,13 @@ def ComputeQSPResponse(
         phiset: array of QSP phases
         signal_operator: QSP signal-dependent operation ['Wx', 'Wz']
         measurement: measurement basis (defaults to signal operator basis)
+        chebyshev_fit: if True, only evaluate the QSP sequence at Chebyshev
+            nodes, and interpolate the response to adat; this is much faster
+            when len(adat) is large compared with len(phiset)
 
     Returns:
         Response object.
     """
-    pdat = []
 
     if measurement is None:
         if signal_operator == "Wx":
@@ -34,10 +52,12 @@ def ComputeQSPResponse(
 
     # define model parameters
     model = (signal_operator, measurement)
+    # signal operators are built for all of adat at once, as an array with
+    # shape (len(adat), 2, 2)
     if signal_operator == "Wx":
-        def sig_op(a): return np.array(
-            [[a, 1j * np.sqrt(1 - a**2)],
-             [1j * np.sqrt(1 - a**2), a]])
+        def sig_op(a, s): return np.moveaxis(np.array(
+            [[a, 1j * s],
+             [1j * s, a]]), -1, 0)
 
         def qsp_op(phi): return np.array(
             [[np.exp(1j * phi), 0.],
@@ -45,9 +65,9 @@ def ComputeQSPResponse(
     elif signal_operator == "Wz":
         H = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
 
-        def sig_op(a): return H @ np.array(
-            [[a, 1j * np.sqrt(1 - a**2)],
-             [1j * np.sqrt(1 - a**2), a]]) @ H
+        def sig_op(a, s): return H @ np.moveaxis(np.array(
+            [[a, 1j * s],
+             [1j * s, a]]), -1, 0) @ H
 
         def qsp_op(phi): return H @ np.array(
             [[np.exp(1j * phi), 0.],
@@ -71,14 +91,46 @@ def ComputeQSPResponse(
     for phi in phiset:
         pmats.append(qsp_op(phi))
 
-    for a in adat:
-        W = sig_op(a)
-        U = pmats[0]
+    def response(adat, sdat):
+        # sdat gives the branch of sqrt(1 - a^2) used in the signal operator;
+        # the product is accumulated for every a at once, looping only over
+        # the phases
+        W = sig_op(np.asarray(adat, dtype=np.float64),
+                   np.asarray(sdat, dtype=np.float64))
+        U = np.broadcast_to(pmats[0], W.shape)
         for pm in pmats[1:]:
             U = U @ W @ pm
-        pdat.append((p_state.T @ U @ p_state)[0, 0])
-
-    pdat = np.array(pdat, dtype=np.complex128)
+        pdat = (p_state.T @ U @ p_state)[:, 0, 0]
+        return np.array(pdat, dtype=np.complex128)
+
+    avals = np.asarray(adat)
+    if chebyshev_fit:
+        # The response is A(a) + sqrt(1 - a^2) * B(a), with A and B polynomials
+        # of degree < len(phiset).  Flipping the sign of sqrt(1 - a^2)
+        # separates the two, so A and B can be interpolated from the response
+        # at len(phiset) Chebyshev nodes.
+        deg = len(phiset) - 1
+        # Chebyshev nodes of the first kind, cos(theta_j)
+        thetas = np.pi * (np.arange(deg + 1) + 0.5) / (deg + 1)
+        nodes = np.cos(thetas)
+        snodes = np.sin(thetas)
+        rplus = response(nodes, snodes)
+        rminus = response(nodes, -snodes)
+        # the T_k are discretely orthogonal on these nodes, so the
+        # interpolating coefficients are a single O(d^2) product, rather than
+        # the O(d^3) least squares solve of chebfit; T_k(cos(theta)) =
+        # cos(k * theta) is used since it is exact, unlike chebvander
+        vander = np.cos(np.outer(thetas, np.arange(deg + 1)))
+        acoefs, bcoefs = (2. / (deg + 1)) * (vander.T @ np.stack(
+            [(rplus + rminus) / 2, (rplus - rminus) / (2 * snodes)], axis=1)).T
+        acoefs[0] /= 2
+        bcoefs[0] /= 2
+        pdat = np.polynomial.chebyshev.chebval(avals, acoefs) + \
+            np.sqrt(1 - avals**2) * \
+            np.polynomial.chebyshev.chebval(avals, bcoefs)
+        pdat = np.asarray(pdat, dtype=np.complex128)
+    else:
+        pdat = response(avals, np.sqrt(1 - avals**2))
 
     ret = {'adat': adat,
            'pdat': pdat,
@@ -102,7 +154,8 @@ def PlotQSPResponse(
         plot_positive_only=False,
         plot_real_only=False,
         plot_tight_y=False,
-        show_qsp_model_plot=False):
+        show_qsp_model_plot=False,
+        x_grid=None):
     """
     Plot QSP response.
 
@@ -125,25 +178,39 @@ def PlotQSPResponse(
         plot_tight_y: if True, set y-axis scale to be from min to max of real
             part; else go from +1.5 max to -1.5 max
         show_qsp_model_plot: if True, use qsp_model.plot_qsp_response
+        x_grid: array of inputs at which to evaluate and plot the response (and
+            target); defaults to npts points from -1 (or 0, if
+            plot_positive_only) to 1
 
     Returns:
         Response object.
     """
 
+    # matplotlib is only imported when plotting, since ComputeQSPResponse is
+    # also used (e.g. by angle_sequence) without any plotting
+    import matplotlib.pyplot as plt
+
     if show_qsp_model_plot:
         import pyqsp.qsp_models as qsp_models
         return qsp_models.plot_qsp_response(
             target, model=None, phis=phiset, title=title)
 
-    if plot_positive_only:
+    if x_grid is not None:
+        adat = np.asarray(x_grid)
+        npts = len(adat)
+    elif plot_positive_only:
         adat = np.linspace(0., 1., npts)
     else:
         adat = np.linspace(-1., 1., npts)
 
-    qspr = ComputeQSPResponse(adat,
-                              phiset,
-                              signal_operator=signal_operator,
-                              measurement=measurement)
+    # the sequence only needs to be evaluated at 2 * len(phiset) points to
+    # interpolate the response, which is far fewer than npts for dense plots
+    qspr = ComputeQSPResponse(
+        adat,
+        phiset,
+        signal_operator=signal_operator,
+        measurement=measurement,
+        chebyshev_fit=_chebyshev_fit_is_faster(npts, len(phiset)))
     pdat = qspr['pdat']
     plt.figure(figsize=[8, 5])
 
@@ -156,9 +223,7 @@ def PlotQSPResponse(
                  linewidth=3, alpha=0.5)
 
     if target is not None:
-        L = np.max(np.abs(adat))
-        xref = np.linspace(-L, L, 401)
-        plt.plot(xref, target(xref), 'k--', label="target function",
+        plt.plot(adat, target(adat), 'k--', label="target function",
                  linewidth=3, alpha=0.5)
 
     if plot_magnitude:
@@ -203,6 +268,8 @@ def PlotQSPPhases(phiset, show=True):
         if provided
     target - reference function, if provided
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=[8, 5])
 
     plt.stem(phiset, markerfmt='bo', basefmt='k-')
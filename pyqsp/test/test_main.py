@@ -1,6 +1,13 @@
+import contextlib
+import io
+import json
 import os
+import subprocess
+import sys
 import unittest
 
+import numpy as np
+
 from pyqsp import main
 
 # -----------------------------------------------------------------------------
@@ -19,6 +26,7 @@ test_cmds = [
     "--plot-positive-only --plot-real-only --seqargs 30,0.3 efilter",
     "--plot-positive-only --plot-real-only --seqargs=20,3.5 gibbs",
     "--plot-real-only --seqargs=20,0.6,15 relu",
+    "--output-json --poly=-1,0,2 poly2angles",
 ]
 
 
@@ -35,6 +43,28 @@ class Test_main(unittest.TestCase):
                 print(f"[pyqsp.test_main testing '{cmd}'")
                 phiset = main.CommandLine(arglist=cmd.split(" "))
 
+    def test_main_output_json(self):
+        # the phases depend on a random choice of roots in completion, so the
+        # same seed is used for both commands
+        np.random.seed(0)
+        phiset = main.CommandLine(
+            arglist="--return-angles --poly=-1,0,2 poly2angles".split(" "))
+        np.random.seed(0)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            main.CommandLine(
+                arglist="--output-json --poly=-1,0,2 poly2angles".split(" "))
+        output = stdout.getvalue().strip().splitlines()[-1]
+        self.assertEqual(json.loads(output), list(phiset))
+
+    def test_main_import(self):
+        # pyqsp.poly (and its scipy imports) should only load when used
+        code = ("import sys, pyqsp.main; "
+                "print('pyqsp.poly' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
     def test_main_tf(self):
         '''
         These are slow tests, and run only if PYQSP_TEST_QSP_MODELS is set in the environment
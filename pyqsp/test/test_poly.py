@@ -1,3 +1,5 @@
+import contextlib
+import io
 import unittest
 
 import numpy as np
@@ -39,6 +41,43 @@ class Test_poly(unittest.TestCase):
         # print(f"diff={diff}")
         assert diff < 0.1
 
+    def test_hamsim_jacobi_anger1(self):
+        '''
+        unit test to ensure that the Jacobi-Anger approximations to cos(tau x) and sin(tau x) are close
+        '''
+        tau = 10
+        epsilon = 0.01
+        xval = np.linspace(-1, 1, 101)
+        gcos = pyqsp.poly.PolyCosineTX().generate(
+            tau, epsilon, return_coef=False, ensure_bounded=False)
+        gsin = pyqsp.poly.PolySineTX().generate(
+            tau, epsilon, return_coef=False, ensure_bounded=False)
+        assert abs(gcos(xval) - np.cos(tau * xval)).max() < epsilon
+        assert abs(gsin(xval) - np.sin(tau * xval)).max() < epsilon
+
+    def test_cached_generate1(self):
+        '''
+        unit test to ensure that polynomials generated again (using the cached
+        normalization) are the same, are independent copies, and still print
+        the diagnostic output
+        '''
+        pg = pyqsp.poly.PolyOneOverX()
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            pcoefs1, scale1 = pg.generate(3, 0.3, return_scale=True)
+        assert "[PolyOneOverX] minimum" in stdout.getvalue()
+        expected = np.copy(pcoefs1)
+        pcoefs1[:] = 0
+        hits = pyqsp.poly._minimize_polynomial.cache_info().hits
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            pcoefs2, scale2 = pyqsp.poly.PolyOneOverX().generate(
+                kappa=3, epsilon=0.3, return_scale=True)
+        assert "[PolyOneOverX] minimum" in stdout.getvalue()
+        assert pyqsp.poly._minimize_polynomial.cache_info().hits == hits + 1
+        assert np.allclose(pcoefs2, expected)
+        assert scale1 == scale2
+
     def test_poly_one_over_x_response1(self):
         pg = pyqsp.poly.PolyOneOverX()
         pcoefs = pg.generate(3, 0.3, return_coef=True, ensure_bounded=True)
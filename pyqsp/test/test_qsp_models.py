@@ -106,3 +106,26 @@ class Test_qsp_models(unittest.TestCase):
             model, return_all=True)
         desired = f(np.cos(all_th))
         assert abs(response - desired).mean() < 0.1
+
+    def test_qsp_circuit_response(self):
+        if not self.is_enabled():
+            return
+        phis = np.random.uniform(-np.pi, np.pi, 8)
+        thetas = np.linspace(0.1, np.pi - 0.1, 20)
+        qsp_circuit = qsp_models.QSPCircuit(phis)
+        pxs = qsp_circuit.eval_px(thetas)
+        qxs = qsp_circuit.eval_qx(thetas)
+
+        # reference values from simulating the cirq circuit per theta
+        sim_us = qsp_circuit._simulate_unitaries(thetas)
+        assert np.max(np.abs(sim_us[:, 0, 0] - pxs)) < 1e-10
+        assert np.max(np.abs(sim_us[:, 0, 1] / (1j * np.sin(thetas)) - qxs)) < 1e-10
+
+        # the numpy fallback should agree with the (possibly numba) kernel
+        from pyqsp.qsp_models._qsp_kernel import _qsp_unitaries_numpy
+        np_us = _qsp_unitaries_numpy(qsp_circuit._rz, thetas)
+        assert np.max(np.abs(np_us - sim_us)) < 1e-10
+
+        # single thetas are evaluated by a separate scalar path
+        assert abs(qsp_circuit.eval_px([thetas[3]])[0] - pxs[3]) < 1e-10
+        assert abs(qsp_circuit.eval_qx(thetas[3])[0] - qxs[3]) < 1e-10
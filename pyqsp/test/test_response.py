@@ -52,5 +52,39 @@ class Test_response(unittest.TestCase):
         print(f"QSP angles = {phiset}")
         response.PlotQSPResponse(phiset, signal_operator="Wz", show=False)
 
+    def test_response_chebyshev_fit(self):
+        phiset = np.random.uniform(-np.pi, np.pi, 12)
+        adat = np.linspace(-1., 1., 101)
+        for signal_operator in ["Wx", "Wz"]:
+            for measurement in ["x", "z"]:
+                with self.subTest(signal_operator=signal_operator,
+                                  measurement=measurement):
+                    expected = response.ComputeQSPResponse(
+                        adat, phiset, signal_operator=signal_operator,
+                        measurement=measurement)["pdat"]
+                    result = response.ComputeQSPResponse(
+                        adat, phiset, signal_operator=signal_operator,
+                        measurement=measurement, chebyshev_fit=True)["pdat"]
+                    self.assertAlmostEqual(
+                        np.max(np.abs(expected - result)), 0.)
+
+    def test_response_chebyshev_fit_high_degree(self):
+        phiset = np.random.uniform(-np.pi, np.pi, 400)
+        adat = np.linspace(-1., 1., 1001)
+        expected = response.ComputeQSPResponse(adat, phiset)["pdat"]
+        result = response.ComputeQSPResponse(
+            adat, phiset, chebyshev_fit=True)["pdat"]
+        self.assertLess(np.max(np.abs(expected - result)), 1e-10)
+
+    def test_chebyshev_fit_is_faster(self):
+        # the fit evaluates the sequence at 2 * nphases points, and has some
+        # overhead on top of that
+        self.assertTrue(response._chebyshev_fit_is_faster(400, 12))
+        self.assertTrue(response._chebyshev_fit_is_faster(4000, 1000))
+        self.assertTrue(response._chebyshev_fit_is_faster(4000, 1500))
+        self.assertFalse(response._chebyshev_fit_is_faster(3010, 1500))
+        self.assertFalse(response._chebyshev_fit_is_faster(100, 50))
+        self.assertFalse(response._chebyshev_fit_is_faster(400, 400))
+
     def test_generate_response1(self):
         pass